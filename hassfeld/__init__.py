@@ -1,32 +1,48 @@
 """Module to interface with Raumfeld smart speakers."""
 import asyncio
-import json
+import hashlib
+import random
 import re
-import sys
 import threading
-from time import sleep
+from collections.abc import Mapping
+from xml.etree import ElementTree
 
 import aiohttp
-import requests
 import xmltodict
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from . import auxilliary as aux
 from . import upnp
 from . import webservice as ws
-from .common import log_critical, log_debug, log_error, log_info, log_warn, logger
+from .common import (
+    create_session,
+    log_critical,
+    log_debug,
+    log_error,
+    log_info,
+    log_warn,
+    logger,
+)
 from .constants import (
     BROWSE_CHILDREN,
+    CHUNK_SIZE_LONG_POLLING,
     CID_SEARCH_ALLTRACKS,
     DEFAULT_PORT_WEBSERVICE,
     DELAY_FAST_UPDATE_CHECKS,
     DELAY_REQUEST_FAILURE_LONG_POLLING,
+    DELAY_REQUEST_FAILURE_LONG_POLLING_MIN,
     FII_PAR_STR,
-    MAX_RETRIES,
+    MAX_CONCURRENT_UPNP,
     PREFERRED_TIMEOUT_LONG_POLLING,
     REQUIRED_METADATA,
     SOUND_SUCCESS,
     SPOTIFY_ACTIVE,
     TIMEOUT_LONG_POLLING,
+    TIMEOUT_TRANSPORT_SETTLE,
     TIMEOUT_WEBSERVICE_ACTION,
     TRANSPORT_STATE_TRANSITIONING,
     TRIGGER_UPDATE_DEVICES,
@@ -39,34 +55,82 @@ from .constants import (
     USER_AGENT_RAUMFELD_OIDS,
 )
 
+DEFAULT_REQUIRED_METADATA_XML = xmltodict.unparse(REQUIRED_METADATA)
+HEADERS_LONG_POLLING = {"Prefer": "wait=" + str(PREFERRED_TIMEOUT_LONG_POLLING)}
+TIMEOUT_HOST_IS_VALID = aiohttp.ClientTimeout(total=3)
+TIMEOUT_LONG_POLLING_REQUEST = aiohttp.ClientTimeout(total=TIMEOUT_LONG_POLLING)
+RE_FII_PAR = re.compile(re.escape(FII_PAR_STR) + "[0-9]+")
+# xmltodict shape of "RaumfeldHost.wsd": path into parsed dict and force_list.
+WSD_DICT_FORMAT = {
+    "devices": (("devices", "device"), ("device",)),
+    "host_info": (("hostInfo",), None),
+    "system_state": (("systemState",), None),
+    "zone_config": (("zoneConfig",), ("zone", "room", "renderer")),
+}
+
+
+class WebServiceData(Mapping):
+    """Web service data as xmltodict dicts, converted on first access."""
+
+    def __init__(self, roots):
+        """Initialize view on parsed XML roots by data name."""
+        self._roots = roots
+        self._dicts = {}
+
+    def __getitem__(self, key):
+        """Return data converted from the current XML root."""
+        path, force_list = WSD_DICT_FORMAT[key]
+        root = self._roots.get(key)
+        if root is None:
+            return {}
+        root_dict = self._dicts.get(key)
+        if root_dict is None or root_dict[0] is not root:
+            data = xmltodict.parse(ElementTree.tostring(root), force_list=force_list)
+            for name in path:
+                data = data[name] if data else {}
+            root_dict = (root, data)
+            self._dicts[key] = root_dict
+        return root_dict[1]
+
+    def __iter__(self):
+        """Iterate over data names."""
+        return iter(WSD_DICT_FORMAT)
+
+    def __len__(self):
+        """Return number of data names."""
+        return len(WSD_DICT_FORMAT)
+
 
 class RaumfeldHost:
     """Class representing a Raumfeld host"""
 
     callback = None
+    # run callback in the default executor to not block the update loops.
+    callback_in_executor = False
 
     def __init__(self, host, port=DEFAULT_PORT_WEBSERVICE, session=None):
         """Initialize raumfeld host."""
         self.host = host
         self.port = str(port)
         self.location = "http://" + self.host + ":" + self.port
+        self._url_hostinfo = self.location + "/getHostInfo"
+        self._url_getzones = self.location + "/getZones"
+        self._url_listdevices = self.location + "/listDevices"
+        self._url_systemstatechannel = self.location + "/SystemStateChannel"
         self.snap = {}
         self._loop = None
+        self._loop_lock = threading.Lock()
 
-        if not session:
-            log_debug("Creating session for aiohttp requests.")
-            self._aiohttp_session = aiohttp.ClientSession()
-        else:
-            self._aiohttp_session = session
+        # created on first use as aiohttp sessions are bound to a running loop.
+        self._session = session
+        self._aiohttp_session_owned = not session
+        if session:
             log_debug("Session for aiohttp requests was passed.")
 
-        # up-to-date data from Raumfeld web service
-        self.wsd = {
-            "devices": {},
-            "host_info": {},
-            "system_state": {},
-            "zone_config": {},
-        }
+        # up-to-date data from Raumfeld web service as parsed XML roots.
+        self._wsd_xml = {}
+        # same data as xmltodict dicts, only converted if read.
+        self.wsd = WebServiceData(self._wsd_xml)
 
         # up-to-date data derived from "self.wsd".
         self.resolve = {
@@ -76,6 +140,8 @@ class RaumfeldHost:
             "udn_to_room": {},
             "roomudn_to_powerstate": {},
             "roomudn_to_rendudn": {},
+            "room_to_rendloc": {},
+            "roomudnset_to_zoneudn": {},
             "zoneudn_to_roomudnlst": {},
             "zone_to_rooms": {},
         }
@@ -88,41 +154,119 @@ class RaumfeldHost:
             "zones": [],
         }
 
+        # sorted room names of each zone for fast validation.
+        self._zone_set = set()
+        # rooms and device locations for fast validation.
+        self._room_set = set()
+        self._location_set = set()
+        # zone locations by set of rooms, reset on zone and device updates.
+        self._zone_loc_cache = {}
+        # limit concurrent UPnP requests of fan-outs per device location.
+        self._upnp_semaphores = {}
+        # details not changing during the lifetime of a device, by UDN.
+        self._device_details = {"manufacturer": {}, "model_name": {}, "renderer": {}}
+
         self._init_done = {
             "devices": False,
             "host_info": False,
             "system_state": False,
             "zone_config": False,
         }
+        # set once all of "self._init_done" are True, created on the loop.
+        self._initial_update = None
+        self._update_task = None
+        # set and replaced on each zone or device update, created on the loop.
+        self._topology_changed = None
+        # event loop the asyncio primitives above are bound to.
+        self._bound_loop = None
 
         # up-to-date data derived from "self.wsd".
         self.media_server_udn = ""
+        self.media_server_loc = ""
         self.update_available = False
 
+    @property
+    def _aiohttp_session(self):
+        """Return session shared by all requests to the Raumfeld host."""
+        if self._session is None:
+            log_debug("Creating session for aiohttp requests.")
+            self._session = create_session()
+        return self._session
+
     def set_logging_level(self, level):
         """set logging level of hassfeld."""
         logger.setLevel(level)
 
+    def close(self):
+        """Stop updates, close session and background loop of sync usage."""
+        if self._loop is None:
+            return
+        self.__run(self.async_close())
+        with self._loop_lock:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+
+    async def async_close(self):
+        """Stop updates and close aiohttp session if created by the host."""
+        if self._update_task is not None:
+            self._update_task.cancel()
+            await asyncio.gather(self._update_task, return_exceptions=True)
+            self._update_task = None
+        if self._aiohttp_session_owned and self._session is not None:
+            await self._session.close()
+            self._session = None
+        # Next start waits for fresh data, events are recreated on its loop.
+        self._init_done = dict.fromkeys(self._init_done, False)
+        self._initial_update = None
+        self._topology_changed = None
+        self._upnp_semaphores = {}
+        self._bound_loop = None
+
+    def host_is_valid(self):
+        """Check whether host is a valid raumfeld host."""
+        return self.__run(self.async_host_is_valid())
+
     async def async_host_is_valid(self):
         """Check whether host is a valid raumfeld host."""
-        url = self.location + "/getHostInfo"
-        timeout = aiohttp.ClientTimeout(total=3)
-        session = aiohttp.ClientSession(timeout=timeout)
+        url = self._url_hostinfo
 
         try:
-            response = await session.get(url)
-            response_xml = await response.read()
-            await session.close()
-        except:
-            await session.close()
+            async with self._aiohttp_session.get(
+                url, timeout=TIMEOUT_HOST_IS_VALID
+            ) as response:
+                response_xml = await response.read()
+            host_info = ElementTree.fromstring(response_xml)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ElementTree.ParseError):
             return False
 
-        host_info = xmltodict.parse(response_xml)
-        return bool("hostName" in host_info["hostInfo"])
+        return bool(
+            host_info.tag == "hostInfo" and host_info.find("hostName") is not None
+        )
 
     async def async_wait_initial_update(self):
-        while False in self._init_done.values():
-            await asyncio.sleep(DELAY_FAST_UPDATE_CHECKS)
+        """Wait for first data from all background updates."""
+        await self.__initial_update_event().wait()
+
+    def __initial_update_event(self):
+        """Return event signaling completion of the initial update."""
+        if self._initial_update is None:
+            self._initial_update = asyncio.Event()
+        return self._initial_update
+
+    def __set_init_done(self, data):
+        """Mark data as initially updated."""
+        self._init_done[data] = True
+        if all(self._init_done.values()):
+            self.__initial_update_event().set()
+
+    @staticmethod
+    def __in_running_loop():
+        """Check whether the caller runs inside an event loop."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return True
 
     #
     # Functions for backgorund data updates from Raumfeld host.
@@ -130,218 +274,334 @@ class RaumfeldHost:
 
     def start_update_thread(self):
         """Start dedicated thread for web service data updates."""
+        if self.__in_running_loop():
+            raise RuntimeError(
+                "Called from a running event loop, use async_start_updates()"
+            )
         # Background thread updating "self.wsd".
-        self._loop = asyncio.new_event_loop()
-        threading.Thread(target=self._loop.run_forever, daemon=True).start()
-
-        asyncio.run_coroutine_threadsafe(self.async_update_all(), self._loop)
+        self.__run(self.async_start_updates())
+
+    def __start_loop(self):
+        """Start event loop in a dedicated thread unless already running."""
+        with self._loop_lock:
+            if self._loop is None:
+                if uvloop is not None:
+                    loop = uvloop.new_event_loop()
+                else:
+                    loop = asyncio.new_event_loop()
+                if hasattr(asyncio, "eager_task_factory"):
+                    # Start tasks synchronously up to their first suspension.
+                    loop.set_task_factory(asyncio.eager_task_factory)
+                threading.Thread(
+                    target=self.__run_loop, args=(loop,), daemon=True
+                ).start()
+                self._loop = loop
+        return self._loop
+
+    @staticmethod
+    def __run_loop(loop):
+        """Run event loop until stopped and close it afterwards."""
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def __run(self, coro):
+        """Run coroutine in the background event loop and wait for result."""
+        if self.__in_running_loop():
+            coro.close()
+            raise RuntimeError("Called from a running event loop, use async API")
+        loop = self.__start_loop()
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    async def async_start_updates(self, session=None):
+        """Start web service data updates in the running loop."""
+        self._update_task = asyncio.ensure_future(self.async_update_all(session))
 
         # Wait for first data as background updates are asynchronous.
-        while False in self._init_done.values():
-            sleep(DELAY_FAST_UPDATE_CHECKS)
+        await self.async_wait_initial_update()
 
     async def async_update_all(self, session=None):
         """Execut all update loops in a group."""
         if not session:
-            log_debug("Creating session for webservice requests.")
-            aiohttp_session = aiohttp.ClientSession()
+            aiohttp_session = self._aiohttp_session
         else:
             aiohttp_session = session
             log_debug("Session for webservice requests was passed.")
-        try:
-            await asyncio.gather(
-                self.async_update_gethostinfo(aiohttp_session),
-                self.async_update_getzones(aiohttp_session),
-                self.async_update_listdevices(aiohttp_session),
-                self.async_update_systemstatechannel(aiohttp_session),
-            )
-        except aiohttp.client_exceptions.ServerDisconnectedError:
-            log_error("Updae loop interrupted because server disconnected")
+        await asyncio.gather(
+            self.async_update_gethostinfo(aiohttp_session),
+            self.async_update_getzones(aiohttp_session),
+            self.async_update_listdevices(aiohttp_session),
+            self.async_update_systemstatechannel(aiohttp_session),
+        )
 
     async def async_update_gethostinfo(self, session):
         """Update loop for host information."""
-        url = self.location + "/getHostInfo"
+        url = self._url_hostinfo
         await self.__long_polling(session, url, self.__update_host_info)
         log_critical("Long-polling endless-loop for updating host information exited")
 
     async def async_update_getzones(self, session):
         """Update loop for zone information."""
-        url = self.location + "/getZones"
+        url = self._url_getzones
         await self.__long_polling(session, url, self.__update_zone_config)
         log_critical("Long-polling endless-loop for updating zone configuration exited")
 
     async def async_update_listdevices(self, session):
         """Update loop for device information."""
-        url = self.location + "/listDevices"
+        url = self._url_listdevices
         await self.__long_polling(session, url, self.__update_devices)
         log_critical("Long-polling endless-loop for updating devices exited")
 
     async def async_update_systemstatechannel(self, session):
         """Update loop for software update information."""
-        url = self.location + "/SystemStateChannel"
+        url = self._url_systemstatechannel
         await self.__long_polling(session, url, self.__update_system_state)
         log_critical("Long-polling endless-loop for updating system state exited")
 
     async def __long_polling(self, session, url, _callback):
         """Long-polling of web service interface."""
         update_id = None
-        timeout = aiohttp.ClientTimeout(total=TIMEOUT_LONG_POLLING)
-        prefer_wait = "wait=" + str(PREFERRED_TIMEOUT_LONG_POLLING)
-        headers = {"Prefer": prefer_wait}
+        last_digest = None
+        headers = dict(HEADERS_LONG_POLLING)
+        failure_delay = DELAY_REQUEST_FAILURE_LONG_POLLING_MIN
         while True:
             if update_id:
                 headers["updateID"] = update_id
             try:
                 async with session.get(
-                    url, headers=headers, timeout=timeout
+                    url, headers=headers, timeout=TIMEOUT_LONG_POLLING_REQUEST
                 ) as response:
+                    if response.status in (200, 304):
+                        failure_delay = DELAY_REQUEST_FAILURE_LONG_POLLING_MIN
                     if response.status == 200:
                         update_id = response.headers["updateID"]
-                        _callback(await response.read())
-                    elif response.status != 304:
-                        await asyncio.sleep(DELAY_REQUEST_FAILURE_LONG_POLLING)
+                        # Parse while the body is still being received.
+                        parser = ElementTree.XMLParser()
+                        content_hash = hashlib.blake2b(digest_size=8)
+                        content_length = response.content_length
+                        if (
+                            content_length is not None
+                            and content_length <= CHUNK_SIZE_LONG_POLLING
+                        ):
+                            # Small replies arrive in one piece anyway.
+                            content = await response.read()
+                            content_hash.update(content)
+                            parser.feed(content)
+                        else:
+                            async for chunk in response.content.iter_chunked(
+                                CHUNK_SIZE_LONG_POLLING
+                            ):
+                                content_hash.update(chunk)
+                                parser.feed(chunk)
+                        root = parser.close()
+                        digest = content_hash.digest()
+                        if digest == last_digest:
+                            log_debug("Skipping unchanged content of: %s", url)
+                            continue
+                        _callback(root)
+                        # Only now, so a payload that failed is applied again.
+                        last_digest = digest
                         continue
-            except asyncio.exceptions.TimeoutError:
+                    if response.status == 304:
+                        continue
+                    if response.status >= 500:
+                        log_warn(
+                            "Long-polling failed with HTTP status: %s" % response.status
+                        )
+                    else:
+                        log_error(
+                            "Long-polling rejected with HTTP status: %s"
+                            % response.status
+                        )
+            except asyncio.TimeoutError:
                 log_info("Long-polling timed out")
-            except asyncio.exceptions.CancelledError:
+                continue
+            except asyncio.CancelledError:
                 log_warn("Long-polling canceled")
                 raise
             except aiohttp.client_exceptions.ServerDisconnectedError:
-                log_error("Long-polling service disconnected")
-                raise
-            except:
-                exc_info = "%s%s" % (sys.exc_info()[0], sys.exc_info()[1])
-                log_critical("Long-polling failed with error: %s" % exc_info)
-            await asyncio.sleep(DELAY_FAST_UPDATE_CHECKS)
+                # Typically the host restarting, so retry like other failures.
+                log_warn("Long-polling service disconnected")
+            except Exception:
+                logger.exception("Long-polling failed")
+            # Request full content again as the host might have restarted.
+            update_id = None
+            headers.pop("updateID", None)
+            # Decorrelated jitter keeps the pollers from retrying in lockstep.
+            failure_delay = min(
+                DELAY_REQUEST_FAILURE_LONG_POLLING,
+                random.uniform(
+                    DELAY_REQUEST_FAILURE_LONG_POLLING_MIN, failure_delay * 3
+                ),
+            )
+            await asyncio.sleep(failure_delay)
 
     #
     # Callback functions for long polling.
     #
 
-    def __update_host_info(self, content_xml):
-        """Update internal data strucrure with host information."""
-        gethostinfo = xmltodict.parse(content_xml)
-        self.wsd["host_info"] = gethostinfo["hostInfo"]
-
-        self._init_done["host_info"] = True
+    def __notify(self, trigger):
+        """Inform user callback about updated data."""
+        if self.callback is None:
+            return
+        if self.callback_in_executor:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(None, self.callback, trigger)
+            future.add_done_callback(self.__log_callback_error)
+        else:
+            self.callback(trigger)
 
-        if self.callback is not None:
-            self.callback(TRIGGER_UPDATE_HOST_INFO)
+    @staticmethod
+    def __log_callback_error(future):
+        """Log exception raised by user callback run in executor."""
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("Update callback failed", exc_info=future.exception())
 
-    def __update_zone_config(self, content_xml):
-        """Update internal data strucrure with zone information."""
-        self.lists["rooms"] = []
-        self.lists["zones"] = []
-        self.resolve["roomudn_to_powerstate"] = {}
-        self.resolve["room_to_udn"] = {}
-        self.resolve["udn_to_room"] = {}
-        self.resolve["zoneudn_to_roomudnlst"] = {}
-
-        getzones = xmltodict.parse(content_xml, force_list=("zone", "room", "renderer"))
-        self.wsd["zone_config"] = getzones["zoneConfig"]
-
-        if "zones" in self.wsd["zone_config"]:
-            for zone_itm in self.wsd["zone_config"]["zones"]["zone"]:
-                zone_rooms = []
-                zone_udn = zone_itm["@udn"]
-                self.resolve["zoneudn_to_roomudnlst"][zone_udn] = []
-
-                for room_itm in zone_itm["room"]:
-                    room_name = room_itm["@name"]
-                    room_udn = room_itm["@udn"]
-                    renderer_udn = room_itm["renderer"][0]["@udn"]
-                    zone_rooms.append(room_name)
-                    self.lists["rooms"].append(room_name)
-                    if "@powerState" in room_itm:
-                        self.resolve["roomudn_to_powerstate"][room_udn] = room_itm[
-                            "@powerState"
-                        ]
-                    else:
-                        log_warn(
-                            "No 'powerState' attribute provided for room: %s"
-                            % room_name
-                        )
-                        self.resolve["roomudn_to_powerstate"][room_udn] = None
-                    self.resolve["room_to_udn"][room_name] = room_udn
-                    self.resolve["udn_to_room"][room_udn] = room_name
-                    self.resolve["zoneudn_to_roomudnlst"][zone_udn].append(room_udn)
-                    self.resolve["roomudn_to_rendudn"][room_udn] = renderer_udn
-
-                self.lists["zones"].append(sorted(zone_rooms))
-
-        if "unassignedRooms" in self.wsd["zone_config"]:
-            for room in self.wsd["zone_config"]["unassignedRooms"]["room"]:
-                room_name = room["@name"]
-                room_udn = room["@udn"]
-                renderer_udn = room["renderer"][0]["@udn"]
-                if "@powerState" in room:
-                    self.resolve["roomudn_to_powerstate"][room_udn] = room[
-                        "@powerState"
-                    ]
-                else:
-                    log_warn(
-                        "No 'powerState' attribute provided for room: %s" % room_name
-                    )
-                    self.resolve["roomudn_to_powerstate"][room_udn] = None
-                self.resolve["room_to_udn"][room_name] = room_udn
-                self.resolve["udn_to_room"][room_udn] = room_name
-                self.lists["rooms"].append(room_name)
-                self.resolve["roomudn_to_rendudn"][room_udn] = renderer_udn
-                if "@spotifyConnect" in room["renderer"][0]:
-                    if room["renderer"][0]["@spotifyConnect"] == SPOTIFY_ACTIVE:
-                        self.lists["spotify_renderer"].append(renderer_udn)
+    def __update_host_info(self, host_info):
+        """Update internal data strucrure with host information."""
+        self._wsd_xml["host_info"] = host_info
 
-        self._init_done["zone_config"] = True
+        self.__set_init_done("host_info")
 
-        if self.callback is not None:
-            self.callback(TRIGGER_UPDATE_ZONE_CONFIG)
+        self.__notify(TRIGGER_UPDATE_HOST_INFO)
 
-    def __update_devices(self, content_xml):
+    def __update_zone_config(self, zone_config):
+        """Update internal data strucrure with zone information."""
+        # Build new data first and swap it in at once, so readers never see
+        # partially updated zone information.
+        rooms = []
+        zones = []
+        zone_set = set()
+        spotify_renderer = []
+        resolve = {
+            "roomudn_to_powerstate": {},
+            "room_to_udn": {},
+            "udn_to_room": {},
+            "roomudn_to_rendudn": {},
+            "roomudnset_to_zoneudn": {},
+            "zoneudn_to_roomudnlst": {},
+        }
+        roomudnset_to_zoneudn = resolve["roomudnset_to_zoneudn"]
+        zoneudn_to_roomudnlst = resolve["zoneudn_to_roomudnlst"]
+
+        for zone_itm in zone_config.iterfind("zones/zone"):
+            zone_rooms = []
+            zone_udn = zone_itm.get("udn")
+            zone_room_udns = zoneudn_to_roomudnlst[zone_udn] = []
+
+            for room_itm in zone_itm.iterfind("room"):
+                room_name, room_udn, _ = self.__ingest_room(room_itm, rooms, resolve)
+                zone_rooms.append(room_name)
+                zone_room_udns.append(room_udn)
+
+            zone_rooms.sort()
+            zones.append(zone_rooms)
+            zone_set.add(tuple(zone_rooms))
+            roomudnset_to_zoneudn[frozenset(zone_room_udns)] = zone_udn
+
+        for room_itm in zone_config.iterfind("unassignedRooms/room"):
+            renderer = self.__ingest_room(room_itm, rooms, resolve)[2]
+            if renderer.get("spotifyConnect") == SPOTIFY_ACTIVE:
+                spotify_renderer.append(renderer.get("udn"))
+
+        self._wsd_xml["zone_config"] = zone_config
+        self.lists["rooms"] = rooms
+        self._room_set = set(rooms)
+        self.lists["zones"] = zones
+        self.lists["spotify_renderer"] = spotify_renderer
+        self._zone_set = zone_set
+        self.resolve.update(resolve)
+        self._zone_loc_cache = {}
+        self.__update_room_to_rendloc()
+        self.__set_topology_changed()
+
+        self.__set_init_done("zone_config")
+
+        self.__notify(TRIGGER_UPDATE_ZONE_CONFIG)
+
+    @staticmethod
+    def __ingest_room(room_itm, rooms, resolve):
+        """Add room to zone data and return its name, UDN and renderer."""
+        room_name = room_itm.get("name")
+        room_udn = room_itm.get("udn")
+        renderer = room_itm.find("renderer")
+        power_state = room_itm.get("powerState")
+        if power_state is None:
+            log_warn("No 'powerState' attribute provided for room: %s" % room_name)
+        rooms.append(room_name)
+        resolve["roomudn_to_powerstate"][room_udn] = power_state
+        resolve["room_to_udn"][room_name] = room_udn
+        resolve["udn_to_room"][room_udn] = room_name
+        resolve["roomudn_to_rendudn"][room_udn] = renderer.get("udn")
+        return room_name, room_udn, renderer
+
+    def __update_devices(self, devices):
         """Update internal data strucrure with device information."""
-        self.lists["locations"] = []
-        self.lists["raumfeld_device_udns"] = []
-        self.resolve["devudn_to_name"] = {}
-        self.resolve["udn_to_devloc"] = {}
-
-        listdevices = xmltodict.parse(content_xml, force_list=("device"))
-        self.wsd["devices"] = listdevices["devices"]["device"]
-
-        for device_itm in self.wsd["devices"]:
-            device_loc = device_itm["@location"]
-            device_type = device_itm["@type"]
-            device_udn = device_itm["@udn"]
-            if "#text" in device_itm:
-                device_name = device_itm["#text"]
-            else:
-                log_warn("Missing '#text' key for device with UDN: %s" % device_udn)
-            self.lists["locations"].append(device_loc)
-            self.resolve["devudn_to_name"][device_udn] = device_name
-            self.resolve["udn_to_devloc"][device_udn] = device_loc
+        locations = []
+        raumfeld_device_udns = []
+        devudn_to_name = {}
+        udn_to_devloc = {}
+        media_server_udn = self.media_server_udn
+        media_server_loc = self.media_server_loc
+
+        for device_itm in devices.iterfind("device"):
+            device_loc = device_itm.get("location")
+            device_type = device_itm.get("type")
+            device_udn = device_itm.get("udn")
+            device_name = device_itm.text
+            if device_name is None:
+                log_warn("Missing name for device with UDN: %s" % device_udn)
+            locations.append(device_loc)
+            devudn_to_name[device_udn] = device_name
+            udn_to_devloc[device_udn] = device_loc
 
             if device_type == TYPE_MEDIA_SERVER:
-                self.media_server_udn = device_udn
+                media_server_udn = device_udn
+                media_server_loc = device_loc
 
             if device_type == TYPE_RAUMFELD_DEVICE:
-                self.lists["raumfeld_device_udns"].append(device_udn)
-
-        self._init_done["devices"] = True
-
-        if self.callback is not None:
-            self.callback(TRIGGER_UPDATE_DEVICES)
-
-    def __update_system_state(self, content_xml):
+                raumfeld_device_udns.append(device_udn)
+
+        self._wsd_xml["devices"] = devices
+        self.lists["locations"] = locations
+        self._location_set = set(locations)
+        self.lists["raumfeld_device_udns"] = raumfeld_device_udns
+        self.resolve["devudn_to_name"] = devudn_to_name
+        self.resolve["udn_to_devloc"] = udn_to_devloc
+        self.media_server_udn = media_server_udn
+        self.media_server_loc = media_server_loc
+        self._zone_loc_cache = {}
+        self.__update_room_to_rendloc()
+        self.__set_topology_changed()
+
+        self.__set_init_done("devices")
+
+        self.__notify(TRIGGER_UPDATE_DEVICES)
+
+    def __update_room_to_rendloc(self):
+        """Update direct mapping of rooms to renderer locations."""
+        room_to_udn = self.resolve["room_to_udn"]
+        roomudn_to_rendudn = self.resolve["roomudn_to_rendudn"]
+        udn_to_devloc = self.resolve["udn_to_devloc"]
+        room_to_rendloc = {}
+        for room, room_udn in room_to_udn.items():
+            rend_udn = roomudn_to_rendudn.get(room_udn)
+            if rend_udn in udn_to_devloc:
+                room_to_rendloc[room] = udn_to_devloc[rend_udn]
+        self.resolve["room_to_rendloc"] = room_to_rendloc
+
+    def __update_system_state(self, system_state):
         """Update internal data strucrure with software update information."""
-        systemstatechannel = xmltodict.parse(content_xml)
-        self.wsd["system_state"] = systemstatechannel["systemState"]
+        self._wsd_xml["system_state"] = system_state
 
-        update_available = self.wsd["system_state"]["updateAvailable"]["@value"]
+        update_available = system_state.find("updateAvailable").get("value")
 
         self.update_available = aux.str_to_bool(update_available)
 
-        self._init_done["system_state"] = True
+        self.__set_init_done("system_state")
 
-        if self.callback is not None:
-            self.callback(TRIGGER_UPDATE_SYSTEM_STATE)
+        self.__notify(TRIGGER_UPDATE_SYSTEM_STATE)
 
     #
     #  Helper functions
@@ -357,7 +617,7 @@ class RaumfeldHost:
             ["Filmraum", 'Küche']
         ]
         """
-        zone_lst = [sorted(x) for x in self.lists["zones"]]
+        zone_lst = [list(x) for x in self.lists["zones"]]
         return zone_lst
 
     def get_rooms(self):
@@ -382,19 +642,16 @@ class RaumfeldHost:
 
     def get_host_room(self):
         """Return room of raumfeld host."""
-        return self.wsd["host_info"]["roomName"]
+        return self._wsd_xml["host_info"].findtext("roomName")
 
     def get_host_name(self):
         """Return raumfeld host's host name."""
-        return self.wsd["host_info"]["hostName"]
+        return self._wsd_xml["host_info"].findtext("hostName")
 
     def roomlst_to_udnlst(self, room_lst):
         """Convert list of room names to list of unique device names."""
-        udn_lst = []
-        for room in room_lst:
-            room_udn = self.resolve["room_to_udn"][room]
-            udn_lst.append(room_udn)
-        return udn_lst
+        room_to_udn = self.resolve["room_to_udn"]
+        return [room_to_udn[room] for room in room_lst]
 
     def roomlst_to_zoneudn(self, room_lst):
         """Convert list of rooms to zone UDN."""
@@ -404,38 +661,86 @@ class RaumfeldHost:
 
     def roomudnlst_to_zoneudn(self, udn_lst):
         """Convert list of room UDN to zone UDN."""
-        match = None
-        zone_udnlst = self.resolve["zoneudn_to_roomudnlst"].keys()
-        for zone_udn in zone_udnlst:
-            if zone_udn in self.resolve["zoneudn_to_roomudnlst"]:
-                zoneroom_udnlst = self.resolve["zoneudn_to_roomudnlst"][zone_udn]
-                if aux.lists_have_same_values(zoneroom_udnlst, udn_lst):
-                    match = zone_udn
-                    break
-        return match
-
-    async def __async_wait_zone_creation(self, old_zone_udn, new_zone_room_lst):
+        return self.resolve["roomudnset_to_zoneudn"].get(frozenset(udn_lst))
+
+    def roomlst_to_zoneloc(self, room_lst):
+        """Convert list of rooms to zone location."""
+        key = frozenset(room_lst)
+        zone_loc = self._zone_loc_cache.get(key)
+        if zone_loc is None:
+            zone_udn = self.roomlst_to_zoneudn(room_lst)
+            zone_loc = self.resolve["udn_to_devloc"][zone_udn]
+            self._zone_loc_cache[key] = zone_loc
+        return zone_loc
+
+    async def __async_wait_zone_creation(self, old_zone_udn, new_zone_udn_lst):
         """Wait for zone creation published and recevied."""
-        max_attempts = int(TIMEOUT_WEBSERVICE_ACTION / DELAY_FAST_UPDATE_CHECKS)
-        for i in range(0, max_attempts):
-            new_zone_udn = self.roomudnlst_to_zoneudn(new_zone_room_lst)
-            if new_zone_udn is None:
-                await asyncio.sleep(DELAY_FAST_UPDATE_CHECKS)
-            elif new_zone_udn == old_zone_udn:
-                await asyncio.sleep(DELAY_FAST_UPDATE_CHECKS)
-            elif new_zone_udn not in self.resolve["udn_to_devloc"]:
-                await asyncio.sleep(DELAY_FAST_UPDATE_CHECKS)
-            else:
+        try:
+            await asyncio.wait_for(
+                self.__async_wait_zone_udn(old_zone_udn, new_zone_udn_lst),
+                TIMEOUT_WEBSERVICE_ACTION,
+            )
+        except asyncio.TimeoutError:
+            log_warn("Zone creation not received for rooms: %s" % new_zone_udn_lst)
+
+    async def __async_wait_zone_udn(self, old_zone_udn, zone_udn_lst):
+        """Wait for new zone of rooms with known location."""
+        while True:
+            # Take event before checking to not miss an update in between.
+            topology_changed = self.__topology_changed_event()
+            new_zone_udn = self.roomudnlst_to_zoneudn(zone_udn_lst)
+            if (
+                new_zone_udn is not None
+                and new_zone_udn != old_zone_udn
+                and new_zone_udn in self.resolve["udn_to_devloc"]
+            ):
                 break
+            await topology_changed.wait()
+
+    def __topology_changed_event(self):
+        """Return event signaling the next zone or device update."""
+        self.__bind_loop()
+        if self._topology_changed is None:
+            self._topology_changed = asyncio.Event()
+        return self._topology_changed
+
+    def __set_topology_changed(self):
+        """Wake up all waiting for a zone or device update."""
+        topology_changed = self._topology_changed
+        if topology_changed is not None:
+            self._topology_changed = None
+            topology_changed.set()
+
+    def __bind_loop(self):
+        """Drop asyncio primitives bound to a previous event loop."""
+        loop = asyncio.get_running_loop()
+        if self._bound_loop is not loop:
+            self._bound_loop = loop
+            self._upnp_semaphores = {}
+            self._topology_changed = None
+
+    async def __async_gather_upnp(self, location, *coros):
+        """Run UPnP requests to a device concurrently, but bounded."""
+        self.__bind_loop()
+        semaphore = self._upnp_semaphores.get(location)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_UPNP)
+            self._upnp_semaphores[location] = semaphore
+
+        async def limited(coro):
+            async with semaphore:
+                return await coro
+
+        return await asyncio.gather(*[limited(coro) for coro in coros])
 
     def zone_is_valid(self, room_lst):
         """Check whether passed zone is valid."""
-        zone = sorted(room_lst)
-        return bool(zone in self.lists["zones"])
+        zone = tuple(sorted(room_lst))
+        return bool(zone in self._zone_set)
 
     def room_is_valid(self, room):
         """Check whether passed room is valid."""
-        return bool(room in self.lists["rooms"])
+        return bool(room in self._room_set)
 
     def rooms_are_valid(self, room_lst):
         """Check whether passed rooms are valid."""
@@ -447,14 +752,12 @@ class RaumfeldHost:
     def room_is_spotify_single_room(self, room):
         """Check whether passed room is in spotify single-room mode."""
         room_udn = self.resolve["room_to_udn"][room]
-        if room_udn in self.resolve["roomudn_to_rendudn"]:
-            rend_udn = self.resolve["roomudn_to_rendudn"][room_udn]
-            return bool(rend_udn in self.lists["spotify_renderer"])
-        return False
+        rend_udn = self.resolve["roomudn_to_rendudn"].get(room_udn)
+        return bool(rend_udn in self.lists["spotify_renderer"])
 
     def location_is_valid(self, location):
         """Check whether passed location is valid."""
-        return bool(location in self.lists["locations"])
+        return bool(location in self._location_set)
 
     def get_room_power_state(self, room):
         """Get current power state of a room."""
@@ -469,6 +772,10 @@ class RaumfeldHost:
     # Raumfeld manipulation methods
     #
 
+    def create_zone(self, room_lst):
+        """Create a new zone based on list of rooms."""
+        return self.__run(self.async_create_zone(room_lst))
+
     async def async_create_zone(self, room_lst):
         """Create a new zone based on list of rooms.
 
@@ -481,11 +788,11 @@ class RaumfeldHost:
             self._aiohttp_session, self.location, room_udns=udn_lst
         )
         # Zone creation may take some time before taking effect.
-        await self.__async_wait_zone_creation(old_zone_udn, room_lst)
+        await self.__async_wait_zone_creation(old_zone_udn, udn_lst)
 
     def add_room_to_zone(self, room, room_lst):
         """Adds a room to a zone."""
-        return asyncio.run(self.async_add_room_to_zone(room, room_lst))
+        return self.__run(self.async_add_room_to_zone(room, room_lst))
 
     async def async_add_room_to_zone(self, room, room_lst):
         """Adds a room to a zone."""
@@ -498,7 +805,7 @@ class RaumfeldHost:
 
     def add_rooms_to_zone(self, room_lst, zone_room_lst):
         """Adds a rooms to a zone."""
-        return asyncio.run(self.async_add_rooms_to_zone(room_lst, zone_room_lst))
+        return self.__run(self.async_add_rooms_to_zone(room_lst, zone_room_lst))
 
     async def async_add_rooms_to_zone(self, room_lst, zone_room_lst):
         """Adds a rooms to a zone."""
@@ -511,7 +818,7 @@ class RaumfeldHost:
 
     def drop_room_from_zone(self, room, room_lst):
         """Removes a room from a zone."""
-        return asyncio.run(self.async_drop_room_from_zone(room, room_lst))
+        return self.__run(self.async_drop_room_from_zone(room, room_lst))
 
     async def async_drop_room_from_zone(self, room, room_lst=None):
         """Removes a room from a zone. if room_lst is provided, it must exist in that zone"""
@@ -527,7 +834,7 @@ class RaumfeldHost:
 
     def set_zone_room_volume(self, zone_room_lst, volume, room_lst=None):
         """Sets volume of rooms in a zone to same level."""
-        return asyncio.run(
+        return self.__run(
             self.async_set_zone_room_volume(zone_room_lst, volume, room_lst)
         )
 
@@ -550,116 +857,111 @@ class RaumfeldHost:
             room_udnlst = self.roomlst_to_udnlst(room_lst)
 
         if zone_udn:
-            for room_udn in room_udnlst:
-                zone_loc = self.resolve["udn_to_devloc"][zone_udn]
-                await upnp.async_set_room_volume(
-                    self._aiohttp_session, zone_loc, room_udn, volume, instance_id=0
-                )
+            zone_loc = self.resolve["udn_to_devloc"][zone_udn]
+            await self.__async_gather_upnp(
+                zone_loc,
+                *[
+                    upnp.async_set_room_volume(
+                        self._aiohttp_session, zone_loc, room_udn, volume, instance_id=0
+                    )
+                    for room_udn in room_udnlst
+                ]
+            )
 
     def set_zone_mute(self, zone_room_lst, mute=True):
         """Mute zone."""
-        return asyncio.run(self.async_set_zone_mute(zone_room_lst, mute))
+        return self.__run(self.async_set_zone_mute(zone_room_lst, mute))
 
     async def async_set_zone_mute(self, zone_room_lst, mute=True):
         """Mute zone."""
-        zone_udn = self.roomlst_to_zoneudn(zone_room_lst)
-        zone_loc = self.resolve["udn_to_devloc"][zone_udn]
+        zone_loc = self.roomlst_to_zoneloc(zone_room_lst)
         await upnp.async_set_mute(self._aiohttp_session, zone_loc, mute)
 
     def get_zone_mute(self, zone_room_lst):
         """Get mute status of zone."""
-        return asyncio.run(self.async_get_zone_mute(zone_room_lst))
+        return self.__run(self.async_get_zone_mute(zone_room_lst))
 
     async def async_get_zone_mute(self, zone_room_lst):
         """Get mute status of zone."""
-        zone_udn = self.roomlst_to_zoneudn(zone_room_lst)
-        zone_loc = self.resolve["udn_to_devloc"][zone_udn]
+        zone_loc = self.roomlst_to_zoneloc(zone_room_lst)
         mute = await upnp.async_get_mute(self._aiohttp_session, zone_loc)
         return mute
 
     def set_zone_volume(self, zone_room_lst, volume):
         """Set volume to absolute level."""
-        return asyncio.run(self.async_set_zone_volume(zone_room_lst, volume))
+        return self.__run(self.async_set_zone_volume(zone_room_lst, volume))
 
     async def async_set_zone_volume(self, zone_room_lst, volume):
         """Set volume to absolute level."""
-        zone_udn = self.roomlst_to_zoneudn(zone_room_lst)
-        zone_loc = self.resolve["udn_to_devloc"][zone_udn]
+        zone_loc = self.roomlst_to_zoneloc(zone_room_lst)
         await upnp.async_set_volume(self._aiohttp_session, zone_loc, volume)
 
     def change_zone_volume(self, zone_room_lst, amount):
         """Change the volume of zone up or down."""
-        return asyncio.run(self.async_change_zone_volume(zone_room_lst, amount))
+        return self.__run(self.async_change_zone_volume(zone_room_lst, amount))
 
     async def async_change_zone_volume(self, zone_room_lst, amount):
         """Change the volume of zone up or down."""
-        zone_udn = self.roomlst_to_zoneudn(zone_room_lst)
-        zone_loc = self.resolve["udn_to_devloc"][zone_udn]
+        zone_loc = self.roomlst_to_zoneloc(zone_room_lst)
         await upnp.async_change_volume(self._aiohttp_session, zone_loc, amount)
 
     def zone_stop(self, zone_room_lst):
         """Stop playing media on zone."""
-        return asyncio.run(self.async_zone_stop(zone_room_lst))
+        return self.__run(self.async_zone_stop(zone_room_lst))
 
     async def async_zone_stop(self, zone_room_lst):
         """Stop playing media on zone."""
-        zone_udn = self.roomlst_to_zoneudn(zone_room_lst)
-        zone_loc = self.resolve["udn_to_devloc"][zone_udn]
+        zone_loc = self.roomlst_to_zoneloc(zone_room_lst)
         await upnp.async_stop(self._aiohttp_session, zone_loc)
 
     def zone_play(self, zone_room_lst):
         """Play media on zone."""
-        return asyncio.run(self.async_zone_play(zone_room_lst))
+        return self.__run(self.async_zone_play(zone_room_lst))
 
     async def async_zone_play(self, zone_room_lst):
         """Play media on zone."""
-        zone_udn = self.roomlst_to_zoneudn(zone_room_lst)
-        zone_loc = self.resolve["udn_to_devloc"][zone_udn]
+        zone_loc = self.roomlst_to_zoneloc(zone_room_lst)
         await upnp.async_play(self._aiohttp_session, zone_loc)
 
     def zone_pause(self, zone_room_lst):
         """Pause playing media on zone."""
-        return asyncio.run(self.async_zone_pause(zone_room_lst))
+        return self.__run(self.async_zone_pause(zone_room_lst))
 
     async def async_zone_pause(self, zone_room_lst):
         """Pause playing media on zone."""
-        zone_udn = self.roomlst_to_zoneudn(zone_room_lst)
-        zone_loc = self.resolve["udn_to_devloc"][zone_udn]
+        zone_loc = self.roomlst_to_zoneloc(zone_room_lst)
         await upnp.async_pause(self._aiohttp_session, zone_loc)
 
     def zone_seek(self, zone_room_lst, target):
         """Seek to position on zone."""
-        return asyncio.run(self.async_zone_seek(zone_room_lst, target))
+        return self.__run(self.async_zone_seek(zone_room_lst, target))
 
     async def async_zone_seek(self, zone_room_lst, target):
         """Seek to position on zone."""
-        zone_udn = self.roomlst_to_zoneudn(zone_room_lst)
-        zone_loc = self.resolve["udn_to_devloc"][zone_udn]
+        zone_loc = self.roomlst_to_zoneloc(zone_room_lst)
         await upnp.async_seek(self._aiohttp_session, zone_loc, "ABS_TIME", target)
 
     def zone_next_track(self, zone_room_lst):
         """Play next track of zone."""
-        return asyncio.run(self.async_zone_next_track(zone_room_lst))
+        return self.__run(self.async_zone_next_track(zone_room_lst))
 
     async def async_zone_next_track(self, zone_room_lst):
         """Play next track of zone."""
-        zone_udn = self.roomlst_to_zoneudn(zone_room_lst)
-        zone_loc = self.resolve["udn_to_devloc"][zone_udn]
+        zone_loc = self.roomlst_to_zoneloc(zone_room_lst)
         await upnp.async_next_track(self._aiohttp_session, zone_loc)
 
     def zone_previous_track(self, zone_room_lst):
         """Play previous track of zone."""
-        return asyncio.run(self.async_zone_previous_track(zone_room_lst))
+        return self.__run(self.async_zone_previous_track(zone_room_lst))
 
     async def async_zone_previous_track(self, zone_room_lst):
         """Play previous track of zone."""
-        zone_udn = self.roomlst_to_zoneudn(zone_room_lst)
-        zone_loc = self.resolve["udn_to_devloc"][zone_udn]
+        zone_loc = self.roomlst_to_zoneloc(zone_room_lst)
         await upnp.async_previous_track(self._aiohttp_session, zone_loc)
 
     def browse_media_server(self, object_id, browse_flag):
         """Browse media on the media server."""
-        return asyncio.run(self.async_browse_media_server(object_id, browse_flag))
+        return self.__run(self.async_browse_media_server(object_id, browse_flag))
 
     async def async_browse_media_server(self, object_id, browse_flag):
         """Browse media on the media server."""
@@ -669,7 +971,7 @@ class RaumfeldHost:
             if object_id in USER_AGENT_RAUMFELD_OIDS:
                 http_headers = {"User-Agent": USER_AGENT_RAUMFELD}
 
-        media_server_loc = self.resolve["udn_to_devloc"][self.media_server_udn]
+        media_server_loc = self.media_server_loc
         return await upnp.async_browse(
             self._aiohttp_session,
             media_server_loc,
@@ -688,7 +990,7 @@ class RaumfeldHost:
         sort_criteria="",
     ):
         """Search the media server."""
-        return asyncio.run(
+        return self.__run(
             self.async_search_media_server(
                 container_id,
                 search_criteria,
@@ -713,7 +1015,7 @@ class RaumfeldHost:
         Parameters:
         search_criteria='raumfeld:any contains "No son of mine"
         """
-        media_server_loc = self.resolve["udn_to_devloc"][self.media_server_udn]
+        media_server_loc = self.media_server_loc
         response = await upnp.async_search(
             self._aiohttp_session,
             media_server_loc,
@@ -728,7 +1030,7 @@ class RaumfeldHost:
 
     def search_for_play(self, container_id, search_criteria):
         """Search for media and return uri and meta data."""
-        return asyncio.run(self.async_search_for_play(container_id, search_criteria))
+        return self.__run(self.async_search_for_play(container_id, search_criteria))
 
     async def async_search_for_play(self, container_id, search_criteria):
         """Search for media and return uri and meta data."""
@@ -740,7 +1042,7 @@ class RaumfeldHost:
             requested_count=(requested_count),
             sort_criteria=sort_criteria,
         )
-        metadata = xmltodict.parse(metadata_xml)
+        metadata = xmltodict.parse(metadata_xml, dict_constructor=dict)
 
         if "item" in metadata["DIDL-Lite"]:
             uri = metadata["DIDL-Lite"]["item"]["res"]["#text"]
@@ -753,7 +1055,7 @@ class RaumfeldHost:
         self, zone_room_lst, current_uri, current_uri_metadata=None
     ):
         """Set the URI of the track to play and it's meta data in a zone."""
-        return asyncio.run(
+        return self.__run(
             self.async_set_av_transport_uri(
                 zone_room_lst, current_uri, current_uri_metadata
             )
@@ -763,10 +1065,9 @@ class RaumfeldHost:
         self, zone_room_lst, current_uri, current_uri_metadata=None
     ):
         """Set the URI of the track to play and it's meta data in a zone."""
-        zone_udn = self.roomlst_to_zoneudn(zone_room_lst)
-        zone_loc = self.resolve["udn_to_devloc"][zone_udn]
+        zone_loc = self.roomlst_to_zoneloc(zone_room_lst)
         if current_uri_metadata is None:
-            current_uri_metadata = xmltodict.unparse(REQUIRED_METADATA)
+            current_uri_metadata = DEFAULT_REQUIRED_METADATA_XML
         await upnp.async_set_av_transport_uri(
             self._aiohttp_session,
             zone_loc,
@@ -779,7 +1080,7 @@ class RaumfeldHost:
         self, zone_room_lst, search_criteria, container_id=CID_SEARCH_ALLTRACKS
     ):
         """Search for track and play first found."""
-        return asyncio.run(
+        return self.__run(
             self.async_search_and_zone_play(
                 zone_room_lst, search_criteria, container_id
             )
@@ -796,17 +1097,16 @@ class RaumfeldHost:
 
     def get_media_info(self, zone_room_lst):
         """Get media information of zone."""
-        return asyncio.run(self.async_get_media_info(zone_room_lst))
+        return self.__run(self.async_get_media_info(zone_room_lst))
 
     async def async_get_media_info(self, zone_room_lst):
         """Get media information of zone."""
-        zone_udn = self.roomlst_to_zoneudn(zone_room_lst)
-        zone_loc = self.resolve["udn_to_devloc"][zone_udn]
+        zone_loc = self.roomlst_to_zoneloc(zone_room_lst)
         return await upnp.async_get_media_info(self._aiohttp_session, zone_loc)
 
     def get_play_mode(self, zone_room_lst):
         """Get play mode of zone."""
-        return asyncio.run(self.async_get_play_mode(zone_room_lst))
+        return self.__run(self.async_get_play_mode(zone_room_lst))
 
     async def async_get_play_mode(self, zone_room_lst):
         """Get play mode of zone."""
@@ -816,27 +1116,25 @@ class RaumfeldHost:
 
     def get_transport_info(self, zone_room_lst):
         """Get transport information of zone."""
-        return asyncio.run(self.async_get_transport_info(zone_room_lst))
+        return self.__run(self.async_get_transport_info(zone_room_lst))
 
     async def async_get_transport_info(self, zone_room_lst):
         """Get transport information of zone."""
-        zone_udn = self.roomlst_to_zoneudn(zone_room_lst)
-        zone_loc = self.resolve["udn_to_devloc"][zone_udn]
+        zone_loc = self.roomlst_to_zoneloc(zone_room_lst)
         return await upnp.async_get_transport_info(self._aiohttp_session, zone_loc)
 
     def get_zone_volume(self, zone_room_lst):
         """Get volume of zone."""
-        return asyncio.run(self.async_get_zone_volume(zone_room_lst))
+        return self.__run(self.async_get_zone_volume(zone_room_lst))
 
     async def async_get_zone_volume(self, zone_room_lst):
         """Get volume of zone."""
-        zone_udn = self.roomlst_to_zoneudn(zone_room_lst)
-        zone_loc = self.resolve["udn_to_devloc"][zone_udn]
+        zone_loc = self.roomlst_to_zoneloc(zone_room_lst)
         return await upnp.async_get_volume(self._aiohttp_session, zone_loc)
 
     def get_position_info(self, zone_room_lst):
         """Get play information from zone."""
-        return asyncio.run(self.async_get_position_info(zone_room_lst))
+        return self.__run(self.async_get_position_info(zone_room_lst))
 
     async def async_get_position_info(self, zone_room_lst):
         """Get play information from zone."""
@@ -851,7 +1149,7 @@ class RaumfeldHost:
 
     def get_zone_position(self, zone_room_lst):
         """Get play position from zone."""
-        return asyncio.run(self.async_get_zone_position(zone_room_lst))
+        return self.__run(self.async_get_zone_position(zone_room_lst))
 
     async def async_get_zone_position(self, zone_room_lst):
         """Get play position from zone."""
@@ -860,96 +1158,127 @@ class RaumfeldHost:
 
     def get_transport_settings(self, zone_room_lst):
         """Get transport settings from zone."""
-        return asyncio.run(self.async_get_transport_settings(zone_room_lst))
+        return self.__run(self.async_get_transport_settings(zone_room_lst))
 
     async def async_get_transport_settings(self, zone_room_lst):
         """Get transport settings from zone."""
-        zone_udn = self.roomlst_to_zoneudn(zone_room_lst)
-        zone_loc = self.resolve["udn_to_devloc"][zone_udn]
+        zone_loc = self.roomlst_to_zoneloc(zone_room_lst)
         return await upnp.async_get_transport_settings(self._aiohttp_session, zone_loc)
 
     def set_play_mode(self, zone_room_lst, play_mode):
         """Set play mode of zone."""
-        return asyncio.run(self.async_set_play_mode(zone_room_lst, play_mode))
+        return self.__run(self.async_set_play_mode(zone_room_lst, play_mode))
 
     async def async_set_play_mode(self, zone_room_lst, play_mode):
         """Set play mode of zone."""
-        zone_udn = self.roomlst_to_zoneudn(zone_room_lst)
-        zone_loc = self.resolve["udn_to_devloc"][zone_udn]
+        zone_loc = self.roomlst_to_zoneloc(zone_room_lst)
         await upnp.async_set_play_mode(self._aiohttp_session, zone_loc, play_mode)
 
     def room_play_system_sound(self, room, sound=SOUND_SUCCESS):
         """Play system sound on a room."""
-        return asyncio.run(self.async_room_play_system_sound(room, sound))
+        return self.__run(self.async_room_play_system_sound(room, sound))
 
     async def async_room_play_system_sound(self, room, sound=SOUND_SUCCESS):
         """Play system sound on a room."""
-        room_udn = self.resolve["room_to_udn"][room]
-        rend_udn = self.resolve["roomudn_to_rendudn"][room_udn]
-        rend_loc = self.resolve["udn_to_devloc"][rend_udn]
+        rend_loc = self.resolve["room_to_rendloc"][room]
         await upnp.async_play_system_sound(self._aiohttp_session, rend_loc, sound)
 
     def save_zone(self, zone_room_lst, repl_snap=False):
         """Create backup of media state for later restore."""
-        return asyncio.run(self.async_save_zone(zone_room_lst, repl_snap))
+        return self.__run(self.async_save_zone(zone_room_lst, repl_snap))
 
     async def async_save_zone(self, zone_room_lst, repl_snap=False):
         """Create backup of media state for later restore."""
-        key = repr(zone_room_lst)
+        key = frozenset(zone_room_lst)
         if key not in self.snap or repl_snap:
-            media_info = await self.async_get_media_info(zone_room_lst)
-            position_info = await self.async_get_position_info(zone_room_lst)
-            volume = await self.async_get_zone_volume(zone_room_lst)
-            mute = await self.async_get_zone_mute(zone_room_lst)
+            session = self._aiohttp_session
+            zone_loc = self.roomlst_to_zoneloc(zone_room_lst)
+            media_info, position_info, volume, mute = await self.__async_gather_upnp(
+                zone_loc,
+                upnp.async_get_media_info(session, zone_loc),
+                upnp.async_get_position_info(session, zone_loc),
+                upnp.async_get_volume(session, zone_loc),
+                upnp.async_get_mute(session, zone_loc),
+            )
             track = position_info["Track"]
             fii_par = FII_PAR_STR + str(track - 1)
-            self.snap[key] = {}
-            self.snap[key]["uri"] = media_info["CurrentURI"]
-            self.snap[key]["metadata"] = media_info["CurrentURIMetaData"]
-            self.snap[key]["abs_time"] = position_info["AbsTime"]
-            self.snap[key]["fii_par"] = fii_par
-            self.snap[key]["volume"] = volume
-            self.snap[key]["mute"] = mute
-            log_debug("Creating snapshot: 'snap[%s]' = '%s'" % (key, self.snap[key]))
+            self.snap[key] = {
+                "uri": media_info["CurrentURI"],
+                "metadata": media_info["CurrentURIMetaData"],
+                "abs_time": position_info["AbsTime"],
+                "fii_par": fii_par,
+                "volume": volume,
+                "mute": mute,
+            }
+            log_debug("Creating snapshot: 'snap[%s]' = '%s'", key, self.snap[key])
         else:
             log_warn("Read-only snapshot data available for key: '%s'" % (key))
 
     def restore_zone(self, zone_room_lst, del_snap=True):
         """restore media state from previous snapshot."""
-        return asyncio.run(self.async_restore_zone(zone_room_lst, del_snap))
+        return self.__run(self.async_restore_zone(zone_room_lst, del_snap))
 
     async def async_restore_zone(self, zone_room_lst, del_snap=True):
         """restore media state from previous snapshot."""
-        key = repr(zone_room_lst)
-        retries = 0
-        if key in self.snap:
-            orig_uri = self.snap[key]["uri"]
-            fii_par = self.snap[key]["fii_par"]
-            uri = re.sub(FII_PAR_STR + "[0-9]+", fii_par, orig_uri)
+        key = frozenset(zone_room_lst)
+        snap = self.snap.get(key)
+        if snap is not None:
+            orig_uri = snap["uri"]
+            fii_par = snap["fii_par"]
+            uri = RE_FII_PAR.sub(fii_par, orig_uri)
             if fii_par not in uri:
                 uri = orig_uri + fii_par
-            log_debug("URI is: 'uri' = '%s'" % uri)
-            metadata = self.snap[key]["metadata"]
-            abs_time = self.snap[key]["abs_time"]
-            volume = self.snap[key]["volume"]
-            mute = self.snap[key]["mute"]
+            log_debug("URI is: 'uri' = '%s'", uri)
+            metadata = snap["metadata"]
+            abs_time = snap["abs_time"]
+            volume = snap["volume"]
+            mute = snap["mute"]
             if del_snap:
                 self.snap.pop(key, None)
-            await self.async_set_zone_volume(zone_room_lst, 0)
-            await self.async_set_zone_mute(zone_room_lst, mute)
+            zone_loc = self.roomlst_to_zoneloc(zone_room_lst)
+            session = self._aiohttp_session
+            await self.__async_gather_upnp(
+                zone_loc,
+                upnp.async_set_volume(session, zone_loc, 0),
+                upnp.async_set_mute(session, zone_loc, mute),
+            )
             await self.async_set_av_transport_uri(zone_room_lst, uri, metadata)
-            while retries < MAX_RETRIES:
-                transport_info = await self.async_get_transport_info(zone_room_lst)
-                transport_state = transport_info["CurrentTransportState"]
-                if transport_state != TRANSPORT_STATE_TRANSITIONING:
-                    break
-                await asyncio.sleep(DELAY_FAST_UPDATE_CHECKS)
-                retries += 1
+            if not await self.__async_wait_transport_settled(zone_room_lst):
+                log_warn("Transport still transitioning for zone: %s" % zone_room_lst)
             await self.async_zone_seek(zone_room_lst, abs_time)
             await self.async_set_zone_volume(zone_room_lst, volume)
         else:
             log_warn("No snapshot data available for key: '%s'" % (key))
 
+    async def __async_wait_transport_settled(self, zone_room_lst):
+        """Wait for transport state of zone to leave transitioning."""
+        zone_loc = self.roomlst_to_zoneloc(zone_room_lst)
+        loop = asyncio.get_running_loop()
+        # Only checked between polls, so no UPnP request is cut off.
+        deadline = loop.time() + TIMEOUT_TRANSPORT_SETTLE
+        # Check early as most transitions are quick, then back off.
+        delay = DELAY_FAST_UPDATE_CHECKS / 4
+        while True:
+            transport_info = await upnp.async_get_transport_info(
+                self._aiohttp_session, zone_loc
+            )
+            # A failed request counts as still transitioning.
+            if (
+                transport_info
+                and transport_info.get("CurrentTransportState")
+                != TRANSPORT_STATE_TRANSITIONING
+            ):
+                return True
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, DELAY_FAST_UPDATE_CHECKS)
+
+    def enter_automatic_standby(self, room):
+        """Put room speakers into automatic stand-by."""
+        return self.__run(self.async_enter_automatic_standby(room))
+
     async def async_enter_automatic_standby(self, room):
         """Put room speakers into automatic stand-by."""
         room_udn = self.resolve["room_to_udn"][room]
@@ -957,6 +1286,10 @@ class RaumfeldHost:
             self._aiohttp_session, self.location, room_udn
         )
 
+    def enter_manual_standby(self, room):
+        """Put room speakers into manual stand-by (turn off)."""
+        return self.__run(self.async_enter_manual_standby(room))
+
     async def async_enter_manual_standby(self, room):
         """Put room speakers into manual stand-by (turn off)."""
         room_udn = self.resolve["room_to_udn"][room]
@@ -964,6 +1297,10 @@ class RaumfeldHost:
             self._aiohttp_session, self.location, room_udn
         )
 
+    def leave_standby(self, room):
+        """Weak room speakers up from stand-by."""
+        return self.__run(self.async_leave_standby(room))
+
     async def async_leave_standby(self, room):
         """Weak room speakers up from stand-by."""
         room_udn = self.resolve["room_to_udn"][room]
@@ -973,94 +1310,96 @@ class RaumfeldHost:
 
     def room_play(self, room):
         """Play media on room."""
-        return asyncio.run(self.async_room_play(room))
+        return self.__run(self.async_room_play(room))
 
     async def async_room_play(self, room):
         """Play media on room."""
-        room_udn = self.resolve["room_to_udn"][room]
-        rend_udn = self.resolve["roomudn_to_rendudn"][room_udn]
-        rend_loc = self.resolve["udn_to_devloc"][rend_udn]
+        rend_loc = self.resolve["room_to_rendloc"][room]
         await upnp.async_play(self._aiohttp_session, rend_loc)
 
     def room_pause(self, room):
         """Pause media on room."""
-        return asyncio.run(self.async_room_pause(room))
+        return self.__run(self.async_room_pause(room))
 
     async def async_room_pause(self, room):
         """Pause media on room."""
-        room_udn = self.resolve["room_to_udn"][room]
-        rend_udn = self.resolve["roomudn_to_rendudn"][room_udn]
-        rend_loc = self.resolve["udn_to_devloc"][rend_udn]
+        rend_loc = self.resolve["room_to_rendloc"][room]
         await upnp.async_pause(self._aiohttp_session, rend_loc)
 
     def get_room_transport_info(self, room):
         """Get transport information of room."""
-        return asyncio.run(self.async_get_room_transport_info(room))
+        return self.__run(self.async_get_room_transport_info(room))
 
     async def async_get_room_transport_info(self, room):
         """Get transport information of room."""
-        room_udn = self.resolve["room_to_udn"][room]
-        rend_udn = self.resolve["roomudn_to_rendudn"][room_udn]
-        rend_loc = self.resolve["udn_to_devloc"][rend_udn]
+        rend_loc = self.resolve["room_to_rendloc"][room]
         return await upnp.async_get_transport_info(self._aiohttp_session, rend_loc)
 
     def room_next_track(self, room):
         """Play next track of room."""
-        return asyncio.run(self.async_room_next_track(room))
+        return self.__run(self.async_room_next_track(room))
 
     async def async_room_next_track(self, room):
         """Play next track of room."""
-        room_udn = self.resolve["room_to_udn"][room]
-        rend_udn = self.resolve["roomudn_to_rendudn"][room_udn]
-        rend_loc = self.resolve["udn_to_devloc"][rend_udn]
+        rend_loc = self.resolve["room_to_rendloc"][room]
         await upnp.async_next_track(self._aiohttp_session, rend_loc)
 
     def room_previous_track(self, room):
         """Play previous track of room."""
-        return asyncio.run(self.async_room_previous_track(room))
+        return self.__run(self.async_room_previous_track(room))
 
     async def async_room_previous_track(self, room):
         """Play previous track of room."""
-        room_udn = self.resolve["room_to_udn"][room]
-        rend_udn = self.resolve["roomudn_to_rendudn"][room_udn]
-        rend_loc = self.resolve["udn_to_devloc"][rend_udn]
+        rend_loc = self.resolve["room_to_rendloc"][room]
         await upnp.async_previous_track(self._aiohttp_session, rend_loc)
 
     def get_room_volume(self, room):
         """Get volume of room."""
-        return asyncio.run(self.async_get_room_volume(room))
+        return self.__run(self.async_get_room_volume(room))
 
     async def async_get_room_volume(self, room):
         """Get volume of room."""
-        room_udn = self.resolve["room_to_udn"][room]
-        rend_udn = self.resolve["roomudn_to_rendudn"][room_udn]
-        rend_loc = self.resolve["udn_to_devloc"][rend_udn]
+        rend_loc = self.resolve["room_to_rendloc"][room]
         return await upnp.async_get_volume(self._aiohttp_session, rend_loc)
 
     def set_room_volume(self, room, volume):
         """Set volume of room."""
-        return asyncio.run(self.async_set_room_volume(room, volume))
+        return self.__run(self.async_set_room_volume(room, volume))
 
     async def async_set_room_volume(self, room, volume):
         """Set volume of room."""
-        room_udn = self.resolve["room_to_udn"][room]
-        rend_udn = self.resolve["roomudn_to_rendudn"][room_udn]
-        rend_loc = self.resolve["udn_to_devloc"][rend_udn]
+        rend_loc = self.resolve["room_to_rendloc"][room]
         await upnp.async_set_volume(self._aiohttp_session, rend_loc, volume)
 
     # Speaker methods
     def get_device_renderer(self, udn):
         """Return renderer UDN of speaker UDN."""
-        return asyncio.run(self.async_get_device_renderer(udn))
+        return self.__run(self.async_get_device_renderer(udn))
 
     async def async_get_device_renderer(self, udn):
         """Return renderer UDN of speaker UDN."""
-        location = self.device_udn_to_location(udn)
-        return await upnp.async_get_device(self._aiohttp_session, location, "renderer")
+        return await self.__async_get_device_detail(
+            "renderer",
+            udn,
+            lambda session, loc: upnp.async_get_device(session, loc, "renderer"),
+        )
+
+    async def __async_get_device_detail(self, detail, udn, fetch):
+        """Return static device detail, fetched once per UDN."""
+        cache = self._device_details[detail]
+        if udn not in cache:
+            location = self.device_udn_to_location(udn)
+            cache[udn] = asyncio.ensure_future(fetch(self._aiohttp_session, location))
+        # Concurrent callers share one request, shielded from their cancellation.
+        value = await asyncio.shield(cache[udn])
+        if value is None:
+            # Do not keep failed requests.
+            cache.pop(udn, None)
+        return value
 
     def get_device_info(self, udn):
         """Return software version of device."""
-        return asyncio.run(self.async_get_device_info(udn))
+        return self.__run(self.async_get_device_info(udn))
 
     async def async_get_device_info(self, udn):
         """Return software version of device."""
@@ -1069,39 +1408,66 @@ class RaumfeldHost:
 
     def get_device_manufacturer(self, udn):
         """Return manufacturer of device."""
-        return asyncio.run(self.async_get_device_manufacturer(udn))
+        return self.__run(self.async_get_device_manufacturer(udn))
 
     async def async_get_device_manufacturer(self, udn):
         """Return manufacturer of device."""
-        location = self.device_udn_to_location(udn)
-        return await upnp.async_get_manufacturer(self._aiohttp_session, location)
+        return await self.__async_get_device_detail(
+            "manufacturer", udn, upnp.async_get_manufacturer
+        )
 
     def get_device_model_name(self, udn):
         """Return model name of device."""
-        return asyncio.run(self.async_get_device_model_name(udn))
+        return self.__run(self.async_get_device_model_name(udn))
 
     async def async_get_device_model_name(self, udn):
         """Return model name of device."""
-        location = self.device_udn_to_location(udn)
-        return await upnp.async_get_model_name(self._aiohttp_session, location)
+        return await self.__async_get_device_detail(
+            "model_name", udn, upnp.async_get_model_name
+        )
 
     def get_device_update_info(self, udn):
         """Return information of available software update."""
-        return asyncio.run(self.async_get_device_update_info(udn))
+        return self.__run(self.async_get_device_update_info(udn))
 
     async def async_get_device_update_info(self, udn):
         """Return information of available software update."""
         location = self.device_udn_to_location(udn)
         return await upnp.async_get_update_info(self._aiohttp_session, location)
 
+    def get_device_bundle(self, udn):
+        """Return software, manufacturer, model, renderer and update info."""
+        return self.__run(self.async_get_device_bundle(udn))
+
+    async def async_get_device_bundle(self, udn):
+        """Return software, manufacturer, model, renderer and update info."""
+        session = self._aiohttp_session
+        location = self.device_udn_to_location(udn)
+        info, manufacturer, model_name, renderer, update_info = (
+            await self.__async_gather_upnp(
+                location,
+                upnp.async_get_info(session, location),
+                self.async_get_device_manufacturer(udn),
+                self.async_get_device_model_name(udn),
+                self.async_get_device_renderer(udn),
+                upnp.async_get_update_info(session, location),
+            )
+        )
+        return {
+            "info": info,
+            "manufacturer": manufacturer,
+            "model_name": model_name,
+            "renderer": renderer,
+            "update_info": update_info,
+        }
+
     def get_device_update_info_version(self, udn):
         """Return version of available software update."""
-        return asyncio.run(self.async_get_device_update_info_version(udn))
+        return self.__run(self.async_get_device_update_info_version(udn))
 
     async def async_get_device_update_info_version(self, udn):
         """Return version of available software update."""
         response = await self.async_get_device_update_info(udn)
 
         if response:
-            if "Version" in response:
-                return response["Version"]
+            return response.get("Version")
@@ -3,17 +3,32 @@ import inspect
 import logging
 import os
 
+import aiohttp
+
 from hassfeld import __name__ as MODULE_NAME
 
+from .constants import (
+    MAX_CONNECTIONS,
+    MAX_CONNECTIONS_PER_HOST,
+    TIMEOUT_KEEPALIVE,
+    TTL_DNS_CACHE,
+)
+
 logger = logging.getLogger(MODULE_NAME)
 
 
-def log_debug(message):
-    """Logging of debug information."""
+def log_debug(message, *args):
+    """Logging of debug information, formatting args only if enabled."""
+    # Skip the frame inspection below unless debug output is wanted.
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
     name = inspect.currentframe().f_back.f_code.co_name
     filename = inspect.currentframe().f_back.f_code.co_filename
     basename = os.path.basename(filename)
-    logger.debug("%s->%s: %s", basename, name, message)
+    if args:
+        logger.debug("%s->%s: " + message, basename, name, *args)
+    else:
+        logger.debug("%s->%s: %s", basename, name, message)
 
 
 def log_info(message):
@@ -34,3 +49,18 @@ def log_error(message):
 def log_critical(message):
     """Logging of information."""
     logger.critical(message)
+
+
+def create_session():
+    """Create aiohttp session keeping connections to Raumfeld devices alive."""
+    connector = aiohttp.TCPConnector(
+        limit=MAX_CONNECTIONS,
+        limit_per_host=MAX_CONNECTIONS_PER_HOST,
+        keepalive_timeout=TIMEOUT_KEEPALIVE,
+        ttl_dns_cache=TTL_DNS_CACHE,
+        force_close=False,
+    )
+    # Raumfeld devices do not set cookies.
+    return aiohttp.ClientSession(
+        connector=connector, cookie_jar=aiohttp.DummyCookieJar()
+    )
@@ -1,16 +1,20 @@
 """Constants for hassfeld"""
 BROWSE_CHILDREN = "BrowseDirectChildren"
 BROWSE_METADATA = "BrowseMetadata"
+CHUNK_SIZE_LONG_POLLING = 8192
 CID_SEARCH_ARTISTS = "0/My Music/Search/TrackArtists"
 CID_SEARCH_ALBUMS = "0/My Music/Search/Albums"
 CID_SEARCH_COMPOSERS = "0/My Music/Search/Composers"
 CID_SEARCH_ALLTRACKS = "0/My Music/Search/AllTracks"
 DEFAULT_PORT_WEBSERVICE = 47365
 DELAY_REQUEST_FAILURE_LONG_POLLING = 60
+DELAY_REQUEST_FAILURE_LONG_POLLING_MIN = 1
 DELAY_FAST_UPDATE_CHECKS = 0.1
 USER_AGENT_RAUMFELD = "RaumfeldControl/3.10 RaumfeldProtocol"
 USER_AGENT_RAUMFELD_OIDS = ["0/RadioTime", "0/Tidal"]
-MAX_RETRIES = 100
+MAX_CONNECTIONS = 32
+MAX_CONNECTIONS_PER_HOST = 16
+MAX_CONCURRENT_UPNP = 4
 PLAY_MODE_NORMAL = "NORMAL"
 PLAY_MODE_SHUFFLE = "SHUFFLE"
 PLAY_MODE_REPEAT_ONE = "REPEAT_ONE"
@@ -27,8 +31,11 @@ TRANSPORT_STATE_PAUSED = "PAUSED_PLAYBACK"
 TRANSPORT_STATE_PLAYING = "PLAYING"
 TRANSPORT_STATE_STOPPED = "STOPPED"
 TRANSPORT_STATE_TRANSITIONING = "TRANSITIONING"
+TIMEOUT_KEEPALIVE = 75
+TTL_DNS_CACHE = 300
 TIMEOUT_UPNP = 15
 TIMEOUT_LONG_POLLING = 330
+TIMEOUT_TRANSPORT_SETTLE = 10
 TIMEOUT_WEBSERVICE_ACTION = 5
 TRIGGER_UPDATE_DEVICES = "devices"
 TRIGGER_UPDATE_HOST_INFO = "host_info"
@@ -22,7 +22,7 @@ def exception_handler(function):
         try:
             result = await function(*args, **kwargs)
             return result
-        except asyncio.exceptions.TimeoutError:
+        except asyncio.TimeoutError:
             log_info("Function '%s' timed out." % name)
         except client_exceptions.ClientConnectorError:
             log_error(sys.exc_info()[1])
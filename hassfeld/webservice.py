@@ -102,7 +102,7 @@ async def async_ping(session, location):
     """
     url = location + "/Ping"
     response = await session.get(url)
-    pong = xmltodict.parse(await response.text())
+    pong = xmltodict.parse(await response.text(), dict_constructor=dict)
 
     if "response" in pong:
         return pong["response"]
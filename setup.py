@@ -20,7 +20,9 @@ setuptools.setup(
     install_requires=[
         "aiohttp",
         "async_upnp_client>=0.27",
-        "requests",
         "xmltodict",
-    ]
+    ],
+    extras_require={
+        "uvloop": ["uvloop"],
+    },
 )
@@ -0,0 +1,92 @@
+"""Tests for closing and restarting updates of a host."""
+import asyncio
+import threading
+import unittest
+
+from aiohttp import web
+
+import hassfeld
+
+ZONES = b"""<?xml version="1.0" encoding="utf-8"?>
+<zoneConfig numRooms="1"><unassignedRooms>
+<room name="Kitchen" udn="uuid:room" powerState="ACTIVE"><renderer udn="uuid:rend"/></room>
+</unassignedRooms></zoneConfig>"""
+DEVICES = b"""<?xml version="1.0" encoding="utf-8"?><devices>
+<device location="http://127.0.0.1:1/rend.xml" udn="uuid:rend" type="urn:schemas-upnp-org:device:MediaRenderer:1">Kitchen</device>
+</devices>"""
+SYSTEM_STATE = b"""<?xml version="1.0" encoding="utf-8"?>
+<systemState><updateAvailable value="false"/></systemState>"""
+
+
+def host_info(host_name):
+    """Return host information naming the host."""
+    return (
+        '<?xml version="1.0" encoding="utf-8"?><hostInfo><hostName>%s</hostName>'
+        "<roomName>Kitchen</roomName></hostInfo>" % host_name
+    ).encode()
+
+
+class FakeHost:
+    """Raumfeld web service answering long-polling requests."""
+
+    def __init__(self):
+        self.payloads = {
+            "/getHostInfo": host_info("first"),
+            "/getZones": ZONES,
+            "/listDevices": DEVICES,
+            "/SystemStateChannel": SYSTEM_STATE,
+        }
+        self.loop = asyncio.new_event_loop()
+        self.runner = None
+        self.port = None
+
+    async def handler(self, request):
+        if request.headers.get("updateID"):
+            # Nothing changed, hold the request like the real host does.
+            await asyncio.sleep(0.5)
+            return web.Response(status=304)
+        return web.Response(body=self.payloads[request.path], headers={"updateID": "1"})
+
+    async def async_start(self):
+        app = web.Application()
+        for path in self.payloads:
+            app.router.add_get(path, self.handler)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = self.runner.addresses[0][1]
+
+    def start(self):
+        self.loop.run_until_complete(self.async_start())
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+
+    def stop(self):
+        future = asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop)
+        future.result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+class CloseTest(unittest.TestCase):
+    """A closed host must start over cleanly."""
+
+    def setUp(self):
+        self.fake_host = FakeHost()
+        self.fake_host.start()
+        self.addCleanup(self.fake_host.stop)
+        self.host = hassfeld.RaumfeldHost("127.0.0.1", self.fake_host.port)
+        self.addCleanup(self.host.close)
+
+    def test_restart_waits_for_fresh_update(self):
+        self.host.start_update_thread()
+        self.assertEqual(self.host.get_host_name(), "first")
+        self.host.close()
+
+        self.fake_host.payloads["/getHostInfo"] = host_info("second")
+        self.host.start_update_thread()
+        self.assertEqual(self.host.get_host_name(), "second")
+        self.assertEqual(self.host.get_rooms(), ["Kitchen"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+"""Tests for using a host from more than one event loop."""
+import asyncio
+import unittest
+from unittest import mock
+
+import hassfeld
+from hassfeld.constants import MAX_CONCURRENT_UPNP
+
+ROOMS = ["Room %s" % i for i in range(MAX_CONCURRENT_UPNP + 2)]
+ZONE_UDN = "uuid:zone"
+ZONE_LOC = "http://127.0.0.1:1/zone.xml"
+
+
+async def slow_upnp(*args, **kwargs):
+    """Keep UPnP requests pending so the semaphore is contended."""
+    await asyncio.sleep(0.01)
+
+
+class EventLoopTest(unittest.TestCase):
+    """Loop-bound state must not leak from one event loop into the next."""
+
+    def setUp(self):
+        # Session is never used as UPnP calls are patched.
+        self.host = hassfeld.RaumfeldHost("127.0.0.1", 1, session=mock.Mock())
+        room_udns = ["uuid:%s" % room for room in ROOMS]
+        self.host.resolve["room_to_udn"] = dict(zip(ROOMS, room_udns))
+        self.host.resolve["roomudnset_to_zoneudn"] = {frozenset(room_udns): ZONE_UDN}
+        self.host.resolve["udn_to_devloc"] = {ZONE_UDN: ZONE_LOC}
+        patcher = mock.patch.object(
+            hassfeld.upnp, "async_set_room_volume", side_effect=slow_upnp
+        )
+        self.set_room_volume = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_set_zone_room_volume_in_two_loops(self):
+        for _ in range(2):
+            asyncio.run(self.host.async_set_zone_room_volume(ROOMS, 10))
+        self.assertEqual(self.set_room_volume.await_count, 2 * len(ROOMS))
+
+    def test_create_zone_timeout_in_two_loops(self):
+        with mock.patch.object(
+            hassfeld.ws, "async_connect_rooms_to_zone", mock.AsyncMock()
+        ), mock.patch.object(hassfeld, "TIMEOUT_WEBSERVICE_ACTION", 0.01):
+            for _ in range(2):
+                # No zone update arrives, so the wait for it times out.
+                asyncio.run(self.host.async_create_zone(ROOMS[:2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
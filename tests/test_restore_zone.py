@@ -0,0 +1,64 @@
+"""Tests for restoring zone snapshots."""
+import unittest
+from unittest import mock
+
+import hassfeld
+
+ZONE = ["Kitchen"]
+ZONE_LOC = "http://127.0.0.1:1/zone.xml"
+
+
+class RestoreZoneTest(unittest.IsolatedAsyncioTestCase):
+    """Restore must finish even if transport info cannot be fetched."""
+
+    async def asyncSetUp(self):
+        self.host = hassfeld.RaumfeldHost("127.0.0.1", 1)
+        self.host.roomlst_to_zoneloc = mock.Mock(return_value=ZONE_LOC)
+        self.host.snap[frozenset(ZONE)] = {
+            "uri": "http://127.0.0.1/track?fii=0",
+            "fii_par": "&fii=3",
+            "metadata": None,
+            "abs_time": "0:01:23",
+            "volume": 42,
+            "mute": False,
+        }
+        self.upnp = {}
+        for name in (
+            "async_set_volume",
+            "async_set_mute",
+            "async_set_av_transport_uri",
+            "async_seek",
+            "async_get_transport_info",
+        ):
+            patcher = mock.patch.object(hassfeld.upnp, name, mock.AsyncMock())
+            self.upnp[name] = patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self):
+        await self.host.async_close()
+
+    def assert_restored(self):
+        self.upnp["async_seek"].assert_awaited_once_with(
+            mock.ANY, ZONE_LOC, "ABS_TIME", "0:01:23"
+        )
+        self.upnp["async_set_volume"].assert_awaited_with(mock.ANY, ZONE_LOC, 42)
+
+    async def test_failed_poll_is_retried(self):
+        self.upnp["async_get_transport_info"].side_effect = [
+            None,
+            {"CurrentTransportState": "TRANSITIONING"},
+            {"CurrentTransportState": "STOPPED"},
+        ]
+        await self.host.async_restore_zone(ZONE)
+        self.assertEqual(self.upnp["async_get_transport_info"].await_count, 3)
+        self.assert_restored()
+
+    async def test_restores_volume_if_transport_never_settles(self):
+        self.upnp["async_get_transport_info"].return_value = None
+        with mock.patch.object(hassfeld, "TIMEOUT_TRANSPORT_SETTLE", 0.05):
+            await self.host.async_restore_zone(ZONE)
+        self.assert_restored()
+
+
+if __name__ == "__main__":
+    unittest.main()
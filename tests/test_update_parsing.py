@@ -0,0 +1,131 @@
+"""Tests for parsing web service updates."""
+import unittest
+from xml.etree import ElementTree
+
+import xmltodict
+
+import hassfeld
+
+ZONE_CONFIG = """<?xml version="1.0" encoding="utf-8"?>
+<zoneConfig numRooms="4" spotifyMode="single">
+  <zones>
+    <zone udn="uuid:00000000-0000-0000-0000-00000000000z">
+      <room name="Wohnzimmer" udn="uuid:00000000-0000-0000-0000-0000000000r1" powerState="ACTIVE" color="4294967295">
+        <renderer udn="uuid:00000000-0000-0000-0000-0000000000d1" name="Speaker L"/>
+        <renderer udn="uuid:00000000-0000-0000-0000-0000000000d2" name="Speaker R"/>
+      </room>
+      <room name="Badezimmer" udn="uuid:00000000-0000-0000-0000-0000000000r2" powerState="ACTIVE">
+        <renderer udn="uuid:00000000-0000-0000-0000-0000000000d3" name="One S"/>
+      </room>
+    </zone>
+  </zones>
+  <unassignedRooms>
+    <room name="Küche" udn="uuid:00000000-0000-0000-0000-0000000000r3" powerState="MANUAL_STANDBY">
+      <renderer udn="uuid:00000000-0000-0000-0000-0000000000d4" name="One M" spotifyConnect="active"/>
+    </room>
+    <room name="Büro" udn="uuid:00000000-0000-0000-0000-0000000000r4" powerState="AUTOMATIC_STANDBY">
+      <renderer udn="uuid:00000000-0000-0000-0000-0000000000d5" name="Stereo M"/>
+    </room>
+  </unassignedRooms>
+</zoneConfig>
+""".encode()
+
+DEVICES = """<?xml version="1.0" encoding="utf-8"?>
+<devices>
+  <device location="http://192.168.0.10:53813/ms.xml" udn="uuid:00000000-0000-0000-0000-0000000000ms" type="urn:schemas-upnp-org:device:MediaServer:1">Raumfeld MediaServer</device>
+  <device location="http://192.168.0.10:53829/zone.xml" udn="uuid:00000000-0000-0000-0000-00000000000z" type="urn:schemas-upnp-org:device:MediaRenderer:1">Wohnzimmer, Badezimmer</device>
+  <device location="http://192.168.0.11:58920/rend.xml" udn="uuid:00000000-0000-0000-0000-0000000000d4" type="urn:schemas-upnp-org:device:MediaRenderer:1">Küche</device>
+  <device location="http://192.168.0.11:53827/dev.xml" udn="uuid:00000000-0000-0000-0000-0000000000f1" type="urn:schemas-raumfeld-com:device:RaumfeldDevice:1">One M</device>
+</devices>
+""".encode()
+
+HOST_INFO = """<?xml version="1.0" encoding="utf-8"?>
+<hostInfo><hostName>raumfeld-host</hostName><roomName>Wohnzimmer</roomName></hostInfo>
+""".encode()
+
+SYSTEM_STATE = b"""<?xml version="1.0" encoding="utf-8"?>
+<systemState><updateAvailable value="true"/></systemState>
+"""
+
+
+class UpdateParsingTest(unittest.TestCase):
+    """Zone and device updates fill the lookup data and keep "wsd" as before."""
+
+    def setUp(self):
+        self.host = hassfeld.RaumfeldHost("127.0.0.1", 1)
+
+    def update(self, name, content):
+        handler = getattr(self.host, "_RaumfeldHost__update_" + name)
+        handler(ElementTree.fromstring(content))
+
+    def test_zone_config(self):
+        self.update("zone_config", ZONE_CONFIG)
+        self.assertEqual(
+            self.host.get_rooms(), ["Wohnzimmer", "Badezimmer", "Küche", "Büro"]
+        )
+        self.assertEqual(self.host.get_zones(), [["Badezimmer", "Wohnzimmer"]])
+        self.assertTrue(self.host.zone_is_valid(["Wohnzimmer", "Badezimmer"]))
+        self.assertEqual(
+            self.host.roomlst_to_zoneudn(["Badezimmer", "Wohnzimmer"]),
+            "uuid:00000000-0000-0000-0000-00000000000z",
+        )
+        self.assertEqual(self.host.get_room_power_state("Büro"), "AUTOMATIC_STANDBY")
+        self.assertTrue(self.host.room_is_spotify_single_room("Küche"))
+        self.assertFalse(self.host.room_is_spotify_single_room("Büro"))
+        self.assertEqual(
+            self.host.wsd["zone_config"],
+            xmltodict.parse(ZONE_CONFIG, force_list=("zone", "room", "renderer"))[
+                "zoneConfig"
+            ],
+        )
+
+    def test_devices(self):
+        self.update("zone_config", ZONE_CONFIG)
+        self.update("devices", DEVICES)
+        self.assertEqual(
+            self.host.media_server_udn, "uuid:00000000-0000-0000-0000-0000000000ms"
+        )
+        self.assertEqual(
+            self.host.get_raumfeld_device_udns(),
+            ["uuid:00000000-0000-0000-0000-0000000000f1"],
+        )
+        self.assertEqual(
+            self.host.device_udn_to_name("uuid:00000000-0000-0000-0000-0000000000d4"),
+            "Küche",
+        )
+        self.assertEqual(
+            self.host.roomlst_to_zoneloc(["Wohnzimmer", "Badezimmer"]),
+            "http://192.168.0.10:53829/zone.xml",
+        )
+        self.assertEqual(
+            self.host.resolve["room_to_rendloc"],
+            {"Küche": "http://192.168.0.11:58920/rend.xml"},
+        )
+        self.assertEqual(
+            self.host.wsd["devices"],
+            xmltodict.parse(DEVICES, force_list=("device",))["devices"]["device"],
+        )
+
+    def test_host_info(self):
+        self.update("host_info", HOST_INFO)
+        self.assertEqual(self.host.get_host_name(), "raumfeld-host")
+        self.assertEqual(self.host.get_host_room(), "Wohnzimmer")
+        self.assertEqual(
+            self.host.wsd["host_info"], xmltodict.parse(HOST_INFO)["hostInfo"]
+        )
+
+    def test_system_state(self):
+        self.update("system_state", SYSTEM_STATE)
+        self.assertIs(self.host.update_available, True)
+        self.assertEqual(
+            self.host.wsd["system_state"], xmltodict.parse(SYSTEM_STATE)["systemState"]
+        )
+
+    def test_wsd_before_first_update(self):
+        with self.assertRaises(KeyError):
+            self.host.get_host_name()
+        self.assertEqual(dict(self.host.wsd), dict.fromkeys(self.host.wsd, {}))
+
+
+if __name__ == "__main__":
+    unittest.main()